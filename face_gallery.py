@@ -0,0 +1,219 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+GALLERY_VERSION = 1
+GALLERY_DTYPES = ("int8", "float16")
+
+
+def quantize_encodings(encodings, dtype="int8"):
+    """Quantize float64 face encodings, returning (vectors, per-vector scales)"""
+    encodings = np.asarray(encodings, dtype=np.float64)
+
+    if dtype == "int8":
+        # Symmetric per-vector scaling so the largest component maps to ±127
+        scales = np.abs(encodings).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        vectors = np.round(encodings / scales[:, None]).astype(np.int8)
+    elif dtype == "float16":
+        scales = np.ones(len(encodings))
+        vectors = encodings.astype(np.float16)
+    else:
+        raise ValueError(f"Unsupported gallery dtype: {dtype}")
+
+    return vectors, scales.astype(np.float32)
+
+
+def save_gallery(path, names, encodings, dtype="int8", dimensions=128):
+    """Write a compact on-disk gallery that FaceGallery can memory-map"""
+    if len(names) != len(encodings):
+        raise ValueError("Need exactly one name per encoding")
+
+    encodings = np.asarray(encodings, dtype=np.float64).reshape(len(names), dimensions)
+    vectors, scales = quantize_encodings(encodings, dtype)
+
+    # Norms of the dequantized vectors keep distances consistent with what is stored
+    dequantized = vectors.astype(np.float64) * scales[:, None]
+    norms = np.einsum("ij,ij->i", dequantized, dequantized).astype(np.float32)
+
+    # Packed identity table: one UTF-8 blob plus offsets into it
+    encoded_names = [name.encode("utf-8") for name in names]
+    offsets = np.zeros(len(encoded_names) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(name) for name in encoded_names])
+
+    # Build the new gallery beside the old one and swap it in afterwards.
+    # Files a running kiosk has mapped are never truncated, only unlinked.
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    new_path = tempfile.mkdtemp(prefix=".gallery-new-", dir=parent)
+    old_path = None
+    try:
+        # mkdtemp is private to this user; kiosks may run under another account
+        os.chmod(new_path, 0o755)
+        np.save(os.path.join(new_path, "vectors.npy"), vectors)
+        np.save(os.path.join(new_path, "scales.npy"), scales)
+        np.save(os.path.join(new_path, "norms.npy"), norms)
+        np.save(os.path.join(new_path, "name_offsets.npy"), offsets)
+        with open(os.path.join(new_path, "names.bin"), "wb") as f:
+            f.write(b"".join(encoded_names))
+        with open(os.path.join(new_path, "gallery.json"), "w") as f:
+            json.dump({
+                "version": GALLERY_VERSION,
+                "dtype": dtype,
+                "count": len(names),
+                "dimensions": dimensions,
+            }, f)
+
+        # os.replace cannot overwrite a non-empty directory, so move the old one aside first
+        if os.path.exists(path):
+            old_path = tempfile.mkdtemp(prefix=".gallery-old-", dir=parent)
+            os.replace(path, old_path)
+        os.replace(new_path, path)
+    except BaseException:
+        if old_path is not None and not os.path.exists(path):
+            os.replace(old_path, path)
+        shutil.rmtree(new_path, ignore_errors=True)
+        raise
+
+    if old_path is not None:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+
+class FaceGallery:
+    """Read-only face gallery memory-mapped from disk.
+
+    Pages are shared through the OS cache, so several kiosk processes can
+    open the same gallery without each holding a private copy.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, "gallery.json")) as f:
+            meta = json.load(f)
+        if meta["version"] != GALLERY_VERSION:
+            raise ValueError(f"Unsupported gallery version: {meta['version']}")
+
+        self.path = path
+        self.dtype = meta["dtype"]
+        self.count = meta["count"]
+        self.dimensions = meta["dimensions"]
+
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.scales = np.load(os.path.join(path, "scales.npy"), mmap_mode="r")
+        self.norms = np.load(os.path.join(path, "norms.npy"), mmap_mode="r")
+        self.name_offsets = np.load(os.path.join(path, "name_offsets.npy"), mmap_mode="r")
+
+        # Catch galleries written by hand or mixed from different saves
+        if self.vectors.shape != (self.count, self.dimensions):
+            raise ValueError(f"Gallery vectors have shape {self.vectors.shape}, "
+                             f"expected {(self.count, self.dimensions)}")
+        if self.vectors.dtype != np.dtype(self.dtype):
+            raise ValueError(f"Gallery vectors are {self.vectors.dtype}, expected {self.dtype}")
+        if len(self.scales) != self.count or len(self.norms) != self.count:
+            raise ValueError("Gallery scales and norms do not match the entry count")
+        if len(self.name_offsets) != self.count + 1:
+            raise ValueError("Gallery identity table does not match the entry count")
+
+        names_path = os.path.join(path, "names.bin")
+        if os.path.getsize(names_path) > 0:
+            self.names = np.memmap(names_path, dtype=np.uint8, mode="r")
+        else:
+            self.names = np.zeros(0, dtype=np.uint8)  # np.memmap refuses empty files
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        """Size of the mapped data in bytes"""
+        return (self.vectors.nbytes + self.scales.nbytes + self.norms.nbytes
+                + self.name_offsets.nbytes + self.names.nbytes)
+
+    def name(self, index):
+        start, end = int(self.name_offsets[index]), int(self.name_offsets[index + 1])
+        return bytes(self.names[start:end]).decode("utf-8")
+
+    def face_distance(self, face_encoding, chunk_size=4096):
+        """Euclidean distance to every gallery entry, like face_recognition.face_distance"""
+        query = np.asarray(face_encoding, dtype=np.float32)
+        query_norm = float(query @ query)
+        distances = np.empty(self.count, dtype=np.float32)
+
+        # Work in chunks so only a slice of the gallery is ever widened to float32
+        for start in range(0, self.count, chunk_size):
+            end = min(start + chunk_size, self.count)
+            dots = (self.vectors[start:end].astype(np.float32) @ query) * self.scales[start:end]
+            squared = self.norms[start:end] + query_norm - 2.0 * dots
+            distances[start:end] = np.sqrt(np.maximum(squared, 0.0))
+
+        return distances
+
+    def best_match(self, face_encoding, tolerance=0.6):
+        """Return (name, distance) of the closest entry, or (None, distance) if none is close enough"""
+        if self.count == 0:
+            return None, float("inf")
+
+        distances = self.face_distance(face_encoding)
+        index = int(np.argmin(distances))
+        distance = float(distances[index])
+        if distance > tolerance:
+            return None, distance
+        return self.name(index), distance
+
+
+def measure_quantization(encodings, probes, dtype="int8", tolerance=0.6):
+    """Compare a quantized gallery against float64 matching on the same data"""
+    encodings = np.asarray(encodings, dtype=np.float64)
+    probes = np.asarray(probes, dtype=np.float64)
+
+    max_error = 0.0
+    same_best = 0
+    same_decision = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "gallery")
+        save_gallery(path, [str(i) for i in range(len(encodings))], encodings, dtype,
+                     dimensions=encodings.shape[1])
+        gallery = FaceGallery(path)
+        gallery_bytes = gallery.nbytes
+
+        for probe in probes:
+            exact = np.linalg.norm(encodings - probe, axis=1)
+            approx = gallery.face_distance(probe)
+            max_error = max(max_error, float(np.abs(exact - approx).max()))
+            same_best += int(np.argmin(exact) == np.argmin(approx))
+            same_decision += int((exact.min() <= tolerance) == (approx.min() <= tolerance))
+
+    return {
+        "dtype": dtype,
+        "float64_bytes": encodings.nbytes,
+        "gallery_bytes": gallery_bytes,
+        "memory_ratio": encodings.nbytes / gallery_bytes,
+        "max_distance_error": max_error,
+        "best_match_agreement": same_best / len(probes),
+        "decision_agreement": same_decision / len(probes),
+    }
+
+
+if __name__ == "__main__":
+    # Synthetic benchmark: identities plus per-photo noise, scaled like dlib encodings.
+    # Noise is chosen so probes land around the 0.6 tolerance, where rounding
+    # in the quantized distances can actually flip a decision.
+    rng = np.random.default_rng(0)
+    identity_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    probe_count = min(10000, identity_count)
+    identities = rng.normal(0.0, 0.09, size=(identity_count, 128))
+    noise = rng.uniform(0.045, 0.061, size=(probe_count, 1))
+    probes = identities[:probe_count] + rng.normal(0.0, 1.0, size=(probe_count, 128)) * noise
+
+    for dtype in GALLERY_DTYPES:
+        result = measure_quantization(identities, probes, dtype=dtype)
+        print(
+            f"{dtype:>7}: {result['float64_bytes'] / 1e6:.2f} MB -> {result['gallery_bytes'] / 1e6:.2f} MB "
+            f"({result['memory_ratio']:.1f}x smaller), "
+            f"max distance error {result['max_distance_error']:.5f}, "
+            f"best match agreement {result['best_match_agreement']:.2%}, "
+            f"decision agreement {result['decision_agreement']:.2%}"
+        )
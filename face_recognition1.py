@@ -10,6 +10,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QImage, QPixmap, QFont
 
+from tiled_detection import TiledFaceDetector
+
 # Force Qt to use correct platform plugin
 os.environ['QT_QPA_PLATFORM_PLUGIN_PATH'] = '/usr/lib/x86_64-linux-gnu/qt5/plugins/platforms'
 
@@ -51,6 +53,10 @@ class FaceCaptureApp(QWidget):
         self.setLayout(layout)
         self.setStyleSheet("background-color: #222;")
 
+        # 🧩 Tiled detection keeps small faces on high-resolution cameras.
+        # Workers start here, before the camera spins up its own threads.
+        self.detector = TiledFaceDetector(tile_size=1024, overlap=256)
+
         # 📷 Camera + timer
         self.cap = cv2.VideoCapture(0)
         self.timer = QTimer()
@@ -59,6 +65,8 @@ class FaceCaptureApp(QWidget):
 
         self.latest_frame = None
         self.face_locations = []
+        self.pending_detection = None
+        self.pending_frame = None
 
         # 📁 Output folder
         self.output_dir = "captured_passport_faces"
@@ -69,10 +77,16 @@ class FaceCaptureApp(QWidget):
         if not ret:
             return
 
-        self.latest_frame = frame.copy()
-        rgb_frame = frame[:, :, ::-1]  # BGR to RGB
-
-        self.face_locations = face_recognition.face_locations(rgb_frame)
+        # 🔄 Detection runs in the background; boxes update when it finishes
+        if self.pending_detection is None:
+            self.pending_frame = frame.copy()
+            rgb_frame = self.pending_frame[:, :, ::-1]  # BGR to RGB
+            self.pending_detection = self.detector.detect_async(rgb_frame)
+        elif self.pending_detection.done():
+            # Keep the frame the boxes belong to so captures crop the right place
+            self.face_locations = self.pending_detection.result()
+            self.latest_frame = self.pending_frame
+            self.pending_detection = None
 
         # 🟩 Draw green boxes around all faces
         for (top, right, bottom, left) in self.face_locations:
@@ -120,6 +134,7 @@ class FaceCaptureApp(QWidget):
     def closeEvent(self, event):
         self.timer.stop()
         self.cap.release()
+        self.detector.close()
         event.accept()
 
 
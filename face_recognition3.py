@@ -8,6 +8,8 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 from PyQt5.QtGui import QImage, QPixmap, QPainter, QColor, QFont, QPen
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve
 
+from face_gallery import FaceGallery
+
 # Set environment variables for Qt
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 os.environ['QT_QPA_PLATFORM_PLUGIN_PATH'] = '/usr/lib/x86_64-linux-gnu/qt5/plugins/platforms'
@@ -21,6 +23,7 @@ class FaceRecognitionApp(QMainWindow):
 
         # Initialize variables
         self.known_face_encoding = None
+        self.gallery = None
         self.capture = None
         self.timer = QTimer()
         self.process_this_frame = True
@@ -31,6 +34,9 @@ class FaceRecognitionApp(QMainWindow):
         # Setup UI
         self.setup_ui()
 
+        # Load enrolled gallery
+        self.load_gallery("face_gallery")
+
         # Start camera
         self.start_camera()
 
@@ -261,6 +267,38 @@ class FaceRecognitionApp(QMainWindow):
             self.status_label.setStyleSheet("color: red; font-size: 18px; font-weight: bold;")
             print(f"Error loading face: {e}")
 
+    def load_gallery(self, gallery_path):
+        """Memory-map a quantized gallery of enrolled faces if one exists"""
+        try:
+            if not os.path.isdir(gallery_path):
+                return
+
+            self.gallery = FaceGallery(gallery_path)
+            self.status_label.setText(f"Ready - {len(self.gallery)} enrolled faces")
+            self.status_label.setStyleSheet("color: black; font-size: 18px; font-weight: bold;")
+
+        except Exception as e:
+            self.status_label.setText(f"Gallery Error: {str(e)}")
+            self.status_label.setStyleSheet("color: red; font-size: 18px; font-weight: bold;")
+            print(f"Gallery error: {e}")
+
+    def is_authorized(self, face_encoding):
+        """Check a face against the saved face and the enrolled gallery"""
+        if self.known_face_encoding is not None:
+            matches = face_recognition.compare_faces(
+                [self.known_face_encoding],
+                face_encoding,
+                tolerance=0.6  # Adjust tolerance as needed
+            )
+            if True in matches:
+                return True
+
+        if self.gallery is not None:
+            name, _ = self.gallery.best_match(face_encoding, tolerance=0.6)
+            return name is not None
+
+        return False
+
     def start_camera(self):
         """Initialize and start camera capture"""
         try:
@@ -288,7 +326,8 @@ class FaceRecognitionApp(QMainWindow):
             self.current_frame = frame.copy()
 
             # Process every other frame to save CPU
-            if self.process_this_frame and self.known_face_encoding is not None:
+            has_known_faces = self.known_face_encoding is not None or self.gallery is not None
+            if self.process_this_frame and has_known_faces:
                 # Resize and convert color
                 small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
                 rgb_small_frame = small_frame[:, :, ::-1]  # BGR to RGB
@@ -301,14 +340,8 @@ class FaceRecognitionApp(QMainWindow):
                     face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
 
                     for face_encoding in face_encodings:
-                        # Compare with known face
-                        matches = face_recognition.compare_faces(
-                            [self.known_face_encoding],
-                            face_encoding,
-                            tolerance=0.6  # Adjust tolerance as needed
-                        )
-
-                        if True in matches:
+                        # Compare with known faces
+                        if self.is_authorized(face_encoding):
                             if not self.face_detected:
                                 self.face_detected = True
                                 self.lock_animation.toggle_lock(False)
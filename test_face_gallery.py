@@ -0,0 +1,97 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from face_gallery import FaceGallery, quantize_encodings, save_gallery
+
+
+@pytest.fixture
+def encodings():
+    return np.random.default_rng(0).normal(0.0, 0.09, size=(50, 128))
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("int8", 0.003), ("float16", 0.0003)])
+def test_quantize_round_trip(encodings, dtype, tolerance):
+    vectors, scales = quantize_encodings(encodings, dtype)
+    assert vectors.dtype == np.dtype(dtype)
+    assert np.abs(vectors.astype(np.float64) * scales[:, None] - encodings).max() < tolerance
+
+
+def test_quantize_zero_vector():
+    vectors, scales = quantize_encodings(np.zeros((1, 128)))
+    assert not vectors.any()
+    assert np.isfinite(scales).all()
+
+
+def test_quantize_rejects_unknown_dtype(encodings):
+    with pytest.raises(ValueError):
+        quantize_encodings(encodings, "float32")
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_distances_match_float64(tmp_path, encodings, dtype):
+    save_gallery(tmp_path / "gallery", [str(i) for i in range(len(encodings))], encodings, dtype)
+    gallery = FaceGallery(tmp_path / "gallery")
+
+    probe = encodings[7] + 0.01
+    exact = np.linalg.norm(encodings - probe, axis=1)
+    assert np.abs(gallery.face_distance(probe, chunk_size=16) - exact).max() < 0.01
+    assert gallery.best_match(probe) == ("7", pytest.approx(exact[7], abs=0.01))
+
+
+def test_non_ascii_names(tmp_path, encodings):
+    names = ["Zoë", "李雷", "", "Åsa Öberg"]
+    save_gallery(tmp_path / "gallery", names, encodings[:4])
+    gallery = FaceGallery(tmp_path / "gallery")
+    assert [gallery.name(i) for i in range(len(gallery))] == names
+
+
+def test_empty_gallery(tmp_path):
+    save_gallery(tmp_path / "gallery", [], [])
+    gallery = FaceGallery(tmp_path / "gallery")
+    assert len(gallery) == 0
+    assert gallery.face_distance(np.zeros(128)).shape == (0,)
+    assert gallery.best_match(np.zeros(128)) == (None, float("inf"))
+
+
+def test_no_match_beyond_tolerance(tmp_path, encodings):
+    save_gallery(tmp_path / "gallery", ["a"], encodings[:1])
+    name, distance = FaceGallery(tmp_path / "gallery").best_match(-encodings[0])
+    assert name is None and distance > 0.6
+
+
+def test_resave_leaves_open_gallery_intact(tmp_path, encodings):
+    path = tmp_path / "gallery"
+    save_gallery(path, ["old"], encodings[:1])
+    old = FaceGallery(path)
+
+    save_gallery(path, ["new", "newer"], encodings[1:3])
+
+    assert old.name(0) == "old"
+    assert old.face_distance(encodings[0])[0] < 0.01
+    assert len(FaceGallery(path)) == 2
+    assert sorted(os.listdir(tmp_path)) == ["gallery"]
+
+
+def test_rejects_mismatched_files(tmp_path, encodings):
+    path = tmp_path / "gallery"
+    save_gallery(path, ["a", "b"], encodings[:2])
+    meta = json.loads((path / "gallery.json").read_text())
+    meta["count"] = 3
+    (path / "gallery.json").write_text(json.dumps(meta))
+
+    with pytest.raises(ValueError):
+        FaceGallery(path)
+
+
+def test_rejects_mismatched_dtype(tmp_path, encodings):
+    path = tmp_path / "gallery"
+    save_gallery(path, ["a"], encodings[:1], dtype="float16")
+    meta = json.loads((path / "gallery.json").read_text())
+    meta["dtype"] = "int8"
+    (path / "gallery.json").write_text(json.dumps(meta))
+
+    with pytest.raises(ValueError):
+        FaceGallery(path)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import tiled_detection
+from tiled_detection import TiledFaceDetector, non_max_suppression, split_into_tiles
+
+
+@pytest.mark.parametrize("height, width", [(480, 640), (1024, 1024), (1025, 1025), (1080, 1920), (2160, 3840)])
+def test_tiles_cover_every_pixel(height, width):
+    coverage = np.zeros((height, width), dtype=int)
+    for top, left, bottom, right in split_into_tiles(height, width, tile_size=1024, overlap=256):
+        assert bottom - top <= 1024 and right - left <= 1024
+        coverage[top:bottom, left:right] += 1
+    assert coverage.min() >= 1
+
+
+def test_tiles_overlap_by_at_least_overlap():
+    tiles = split_into_tiles(1, 3840, tile_size=1024, overlap=256)
+    for (_, _, _, right), (_, left, _, _) in zip(tiles, tiles[1:]):
+        assert right - left >= 256 - 1
+
+
+def test_frame_just_over_one_tile_is_split_evenly():
+    tiles = split_into_tiles(1025, 1025, tile_size=1024, overlap=256)
+    assert len(tiles) == 4
+    assert {bottom - top for top, _, bottom, _ in tiles} == {641}
+
+
+def test_small_frame_is_one_tile():
+    assert split_into_tiles(480, 640) == [(0, 0, 480, 640)]
+
+
+def test_overlap_must_be_smaller_than_tile():
+    with pytest.raises(ValueError):
+        split_into_tiles(2000, 2000, tile_size=256, overlap=256)
+
+
+def test_nms_drops_face_clipped_at_tile_edge():
+    full = (100, 300, 300, 100)
+    clipped = (100, 300, 300, 250)
+    assert non_max_suppression([clipped, full]) == [full]
+
+
+def test_nms_keeps_separate_faces():
+    faces = [(0, 100, 100, 0), (0, 300, 100, 200)]
+    assert non_max_suppression(faces) == faces
+
+
+def test_nms_empty():
+    assert non_max_suppression([]) == []
+
+
+def test_detector_merges_faces_across_tiles(monkeypatch):
+    faces = [(100, 300, 300, 100), (1000, 1100, 1150, 950), (2000, 3700, 2140, 3560)]
+
+    def fake_detect_tile(tile, origin, upsample=1, model="hog"):
+        # Report every face that overlaps the tile, clipped to its edges
+        oy, ox = origin
+        h, w = tile.shape[:2]
+        found = []
+        for top, right, bottom, left in faces:
+            t, b = max(top, oy), min(bottom, oy + h)
+            l, r = max(left, ox), min(right, ox + w)
+            if b > t and r > l:
+                found.append((t, r, b, l))
+        return found
+
+    monkeypatch.setattr(tiled_detection, "detect_tile", fake_detect_tile)
+
+    detector = TiledFaceDetector(workers=2, use_processes=False)
+    try:
+        assert sorted(detector.detect(np.zeros((2160, 3840, 3), dtype=np.uint8))) == sorted(faces)
+    finally:
+        detector.close()
+
+
+def test_detect_async_returns_future(monkeypatch):
+    monkeypatch.setattr(tiled_detection, "detect_tile", lambda tile, origin, upsample=1, model="hog": [(0, 10, 10, 0)])
+
+    detector = TiledFaceDetector(workers=1, use_processes=False)
+    try:
+        future = detector.detect_async(np.zeros((480, 640, 3), dtype=np.uint8))
+        assert future.result(timeout=5) == [(0, 10, 10, 0)]
+    finally:
+        detector.close()
@@ -0,0 +1,175 @@
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import face_recognition
+import numpy as np
+
+
+def split_into_tiles(height, width, tile_size=1024, overlap=256):
+    """Return (top, left, bottom, right) windows covering the frame with overlap"""
+    if overlap >= tile_size:
+        raise ValueError("overlap must be smaller than tile_size")
+
+    step = tile_size - overlap
+
+    def spans(length):
+        if length <= tile_size:
+            return [(0, length)]
+        # Fewest tiles that fit, shrunk to share the length evenly so that
+        # a frame just over one tile is not covered by near-duplicate tiles
+        count = math.ceil((length - overlap) / step)
+        size = math.ceil((length + (count - 1) * overlap) / count)
+        return [
+            (start, start + size)
+            for start in (round(i * (length - size) / (count - 1)) for i in range(count))
+        ]
+
+    return [
+        (top, left, bottom, right)
+        for (top, bottom) in spans(height)
+        for (left, right) in spans(width)
+    ]
+
+
+def warm_up():
+    """Runs once in each worker so the first frame does not pay for startup"""
+    return os.getpid()
+
+
+def detect_tile(tile, origin, upsample=1, model="hog"):
+    """Detect faces in one tile and shift them back into frame coordinates"""
+    offset_y, offset_x = origin
+    locations = face_recognition.face_locations(
+        np.ascontiguousarray(tile), number_of_times_to_upsample=upsample, model=model
+    )
+    return [
+        (top + offset_y, right + offset_x, bottom + offset_y, left + offset_x)
+        for (top, right, bottom, left) in locations
+    ]
+
+
+def non_max_suppression(face_locations, overlap_threshold=0.5):
+    """Merge duplicate detections from overlapping tiles.
+
+    Overlap is measured against the smaller box, so a face clipped by a tile
+    edge is dropped in favour of the full detection from the neighbouring tile.
+    """
+    if not face_locations:
+        return []
+
+    boxes = np.array(face_locations, dtype=np.float64)
+    top, right, bottom, left = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (bottom - top) * (right - left)
+
+    # Largest boxes first: they are the least likely to be truncated
+    order = np.argsort(areas)[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        inter_h = np.maximum(0, np.minimum(bottom[i], bottom[rest]) - np.maximum(top[i], top[rest]))
+        inter_w = np.maximum(0, np.minimum(right[i], right[rest]) - np.maximum(left[i], left[rest]))
+        overlap = (inter_h * inter_w) / np.minimum(areas[i], areas[rest])
+
+        order = rest[overlap <= overlap_threshold]
+
+    return [tuple(int(v) for v in face_locations[i]) for i in sorted(keep)]
+
+
+class TiledFaceDetector:
+    """Runs face detection on overlapping tiles of a large frame in parallel"""
+
+    def __init__(self, tile_size=1024, overlap=256, workers=None, use_processes=True,
+                 upsample=1, model="hog", overlap_threshold=0.5):
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.upsample = upsample
+        self.model = model
+        self.overlap_threshold = overlap_threshold
+        self.workers = workers or os.cpu_count() or 1
+
+        # dlib holds the GIL for most of the HOG pass, so processes scale
+        # with cores; threads avoid copying tiles and suit the CNN model
+        if use_processes:
+            # Forking once Qt and the camera have started threads can deadlock
+            # the child, so workers come from a clean forkserver instead
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        # Start every worker now rather than lazily on the first frame
+        for future in [self.executor.submit(warm_up) for _ in range(self.workers)]:
+            future.result()
+
+        # Single thread that runs whole-frame detections off the caller's thread
+        self.dispatcher = ThreadPoolExecutor(max_workers=1)
+
+    def detect(self, rgb_frame):
+        """Return face locations for the whole frame as (top, right, bottom, left)"""
+        height, width = rgb_frame.shape[:2]
+
+        # Frames that fit in a single tile gain nothing from splitting
+        if height <= self.tile_size and width <= self.tile_size:
+            return detect_tile(rgb_frame, (0, 0), self.upsample, self.model)
+
+        futures = [
+            self.executor.submit(
+                detect_tile,
+                rgb_frame[top:bottom, left:right],
+                (top, left),
+                self.upsample,
+                self.model,
+            )
+            for (top, left, bottom, right) in split_into_tiles(height, width, self.tile_size, self.overlap)
+        ]
+
+        face_locations = []
+        for future in futures:
+            face_locations.extend(future.result())
+
+        return non_max_suppression(face_locations, self.overlap_threshold)
+
+    def detect_async(self, rgb_frame):
+        """Start detect() in the background and return a Future with its result"""
+        return self.dispatcher.submit(self.detect, rgb_frame)
+
+    def close(self):
+        """Shut down the worker pool"""
+        self.dispatcher.shutdown(wait=False, cancel_futures=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    # Per-frame timing on a 4K frame for a growing number of workers.
+    # Pass a photo to time real content; otherwise a noise frame is used.
+    if len(sys.argv) > 1:
+        image = face_recognition.load_image_file(sys.argv[1])
+        rows = np.linspace(0, image.shape[0] - 1, 2160).astype(int)
+        cols = np.linspace(0, image.shape[1] - 1, 3840).astype(int)
+        frame = image[rows][:, cols]
+    else:
+        frame = np.random.default_rng(0).integers(0, 256, size=(2160, 3840, 3), dtype=np.uint8)
+
+    start = time.perf_counter()
+    detect_tile(frame, (0, 0))
+    print(f"untiled: {time.perf_counter() - start:.3f} s/frame")
+
+    cores = os.cpu_count() or 1
+    for workers in sorted({1, 2, 4, cores}):
+        detector = TiledFaceDetector(workers=workers)
+        detector.detect(frame)
+        start = time.perf_counter()
+        for _ in range(3):
+            face_locations = detector.detect(frame)
+        elapsed = (time.perf_counter() - start) / 3
+        detector.close()
+        print(f"{workers:>2} workers: {elapsed:.3f} s/frame, {len(face_locations)} faces")